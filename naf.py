@@ -1,20 +1,61 @@
-import pandas as pd
+import os
+
+import orjson
 from loguru import logger
 
 NAF_N5_FILE = "naf2008_liste_n5.xls"
+NAF_CACHE_FILE = "naf_cache.json"
+
+
+def _load_cached_naf_codes():
+    try:
+        with open(NAF_CACHE_FILE, "rb") as f:
+            cache = orjson.loads(f.read())
+        if cache["source_mtime"] != os.path.getmtime(NAF_N5_FILE):
+            return None
+        return [(label, code) for label, code in cache["choices"]]
+    except Exception as e:
+        logger.debug(f"NAF cache unavailable: {e}")
+        return None
+
+
+def _write_naf_cache(choices):
+    try:
+        with open(NAF_CACHE_FILE, "wb") as f:
+            f.write(
+                orjson.dumps(
+                    {
+                        "source_mtime": os.path.getmtime(NAF_N5_FILE),
+                        "choices": choices,
+                    }
+                )
+            )
+    except Exception as e:
+        logger.warning(f"Could not write NAF cache: {e}")
 
 
 def get_inquirer_formatted_naf_codes():
+    choices = _load_cached_naf_codes()
+    if choices is not None:
+        logger.info(f"Loaded {len(choices)} NAF codes")
+        return choices
+
     try:
-        df = pd.read_excel(NAF_N5_FILE)
+        # Imported here so a cached start does not pay for pandas
+        import pandas as pd
+
+        df = pd.read_excel(NAF_N5_FILE, usecols=["Code", "Libellé", "include"])
         df = df[df["include"] == "o"]
 
         logger.info(f"Loaded {len(df)} NAF codes")
 
-        code_naf_actifs = df.to_dict(orient="records")
-        result = {item["Code"]: item["Libellé"] for item in code_naf_actifs}
+        choices = [
+            (f"{desc} ({code})", code)
+            for code, desc in zip(df["Code"].to_numpy(), df["Libellé"].to_numpy())
+        ]
     except Exception as e:
         logger.error(f"Error loading NAF codes: {e}")
-        result = {"62.01Z": "Programmation informatique"}
+        return [("Programmation informatique (62.01Z)", "62.01Z")]
 
-    return [(f"{desc} ({code})", code) for code, desc in result.items()]
+    _write_naf_cache(choices)
+    return choices
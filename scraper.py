@@ -1,37 +1,120 @@
-import csv
+import asyncio
 import hashlib
-import json
 import os
-from datetime import datetime
+import tempfile
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import List, Optional
 
-import inquirer
-import openai
-import requests
+import httpx
+import orjson
 from loguru import logger
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 from naf import get_inquirer_formatted_naf_codes
 
 BASE_URL = "https://recherche-entreprises.api.gouv.fr/search"
 NATURE_JURIDIQUE = "5499,5410,5710"  # SARL, SAS
 PER_PAGE = 25
-FILTRE_QUALITE = [
-    "Liquidateur",
-    "Commissaire aux comptes titulaire",
-    "Commissaire aux comptes suppléant",
-]
+MAX_PAGES = 400  # guard against runaway scrapes
+MAX_CONCURRENT_REQUESTS = 10  # keep under the API rate limit
+HTTP_POOL_SIZE = 20
+HTTP_MAX_RETRIES = 3
+HTTP_RETRY_BACKOFF = 0.3  # seconds, doubled on each retry
+HTTP_RETRY_STATUSES = frozenset([429, 502, 503, 504])
+HTTP_RETRY_ERRORS = (httpx.ReadError, httpx.ReadTimeout, httpx.RemoteProtocolError)
+HTTP_MAX_RETRY_AFTER = 60  # seconds, cap on the server's Retry-After
+HTTP_CACHE_DIR = os.path.join("data_output", ".http_cache")
+HTTP_CACHE_EXPIRE = 3600  # seconds
+OPENAI_BATCH_SIZE = 50  # names per LLM call, keeps output bounded
+OPENAI_MAX_CONCURRENT_CALLS = 5  # keep under the OpenAI RPM limit
+OPENAI_MODEL = "gpt-5-mini"
+OPENAI_BATCH_POLL_INTERVAL = 60  # seconds between Batch API status checks
+MAX_NAME_LENGTH = 64  # longer names only cost input tokens
+FILTRE_QUALITE = frozenset(
+    [
+        "Liquidateur",
+        "Commissaire aux comptes titulaire",
+        "Commissaire aux comptes suppléant",
+    ]
+)
 CREATION_MIN_YEAR = 2024
 
 SYSTEM_PROMPT = """
 Met a jour ma liste de noms et indique si ils sont d'origine turque ou non.
+Chaque ligne est un enregistrement JSON avec un id, un nom et un prenom.
 Certains noms peuvent avoir des prenoms Francais apres naturalisation
 """
 
-client = openai.Client(api_key=os.getenv("OPENAI_API_KEY"))
+
+def _http_cache_path(params):
+    key = hashlib.blake2b(
+        orjson.dumps(params, option=orjson.OPT_SORT_KEYS), digest_size=16
+    ).hexdigest()
+    return os.path.join(HTTP_CACHE_DIR, f"{key}.json")
+
+
+def _read_http_cache(params):
+    path = _http_cache_path(params)
+    try:
+        if time.time() - os.path.getmtime(path) > HTTP_CACHE_EXPIRE:
+            _delete_http_cache(params)
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_http_cache(params, content):
+    tmp_path = None
+    try:
+        os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+        # Write aside then rename, so an interrupted run never leaves a
+        # truncated file that looks fresh
+        fd, tmp_path = tempfile.mkstemp(dir=HTTP_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, _http_cache_path(params))
+    except OSError as e:
+        logger.warning(f"Could not write HTTP cache: {e}")
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _delete_http_cache(params):
+    try:
+        os.remove(_http_cache_path(params))
+    except OSError:
+        pass
 
 
-def get_companies(naf, nature_juridique, postal_code=None, departement=None, page=1):
+def _retry_delay(response, attempt):
+    retry_after = response.headers.get("Retry-After")
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                retry_at = parsedate_to_datetime(retry_after)
+                delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(delay, 0), HTTP_MAX_RETRY_AFTER)
+    return HTTP_RETRY_BACKOFF * 2**attempt
+
+
+async def get_companies(
+    http_client: httpx.AsyncClient,
+    semaphore: asyncio.Semaphore,
+    naf,
+    nature_juridique,
+    postal_code=None,
+    departement=None,
+    page=1,
+):
     params = {
         "activite_principale": naf,
         "code_postal": postal_code,
@@ -41,35 +124,50 @@ def get_companies(naf, nature_juridique, postal_code=None, departement=None, pag
         "per_page": PER_PAGE,
         "page": page,
     }
+    # requests used to skip None params, httpx would send them empty
+    params = {k: v for k, v in params.items() if v is not None}
+    # Cache files are read and written off the event loop
+    cached = await asyncio.to_thread(_read_http_cache, params)
+    if cached is not None:
+        try:
+            data = orjson.loads(cached)
+            logger.debug(f"Using cached response for page {page}")
+            return data
+        except orjson.JSONDecodeError as e:
+            logger.warning(f"Discarding unreadable cached page {page}: {e}")
+            await asyncio.to_thread(_delete_http_cache, params)
     try:
-        response = requests.get(BASE_URL, params=params, timeout=10)
+        for attempt in range(HTTP_MAX_RETRIES + 1):
+            last_attempt = attempt == HTTP_MAX_RETRIES
+            try:
+                async with semaphore:
+                    response = await http_client.get(
+                        BASE_URL, params=params, timeout=10
+                    )
+            except HTTP_RETRY_ERRORS as e:
+                # Failed connects are already retried by the transport
+                if last_attempt:
+                    raise
+                delay = HTTP_RETRY_BACKOFF * 2**attempt
+                logger.debug(f"{e!r} on page {page}, retrying in {delay}s")
+                await asyncio.sleep(delay)
+                continue
+            if response.status_code not in HTTP_RETRY_STATUSES or last_attempt:
+                break
+            delay = _retry_delay(response, attempt)
+            logger.debug(
+                f"Got {response.status_code} on page {page}, retrying in {delay}s"
+            )
+            await asyncio.sleep(delay)
         response.raise_for_status()
-        return response.json()
+        data = orjson.loads(response.content)
+        await asyncio.to_thread(_write_http_cache, params, response.content)
+        return data
     except Exception as e:
         logger.error(f"Error fetching companies: {e}")
         return {"results": [], "error": str(e)}
 
 
-def format_results(companies):
-    formatted = []
-    for company in companies.get("results", []):
-        formatted.append(
-            {
-                "siren": company.get("siren"),
-                "nom_complet": company.get("nom_complet"),
-                "nom_raison_sociale": company.get("nom_raison_sociale"),
-                "activite_principale": company.get("activite_principale"),
-                "dirigeants": company.get("dirigeants", []),
-                "adresse": company.get("siege", {}).get("adresse", ""),
-                "code_postal": company.get("siege", {}).get("code_postal", ""),
-                "libelle_commune": company.get("siege", {}).get("libelle_commune", ""),
-                "date_creation": company.get("date_creation"),
-                "nature_juridique": company.get("nature_juridique"),
-            }
-        )
-    return formatted
-
-
 def get_companies_listing(
     naf: str,
     postal_code: Optional[str] = None,
@@ -85,67 +183,275 @@ def get_companies_listing(
         else NATURE_JURIDIQUE
     )
     try:
-        # Fetch first page
-        data = get_companies(naf, type_entreprises, postal_code, departement, page=1)
-        total_pages = data.get("total_pages", 1)
-        all_results = format_results(data)
-
-        # Fetch additional pages if needed
-        if total_pages > 1:
-            for page_num in range(2, total_pages + 1):
-                logger.debug(f"Fetching page {page_num} of {total_pages}")
-                page_data = get_companies(
-                    naf, type_entreprises, postal_code, departement, page=page_num
-                )
-                all_results.extend(format_results(page_data))
-
-        logger.info(
-            f"Returning {len(all_results)} companies across {total_pages} pages"
+        return asyncio.run(
+            _fetch_all_pages(naf, type_entreprises, postal_code, departement)
         )
-        return {
-            "results_count": len(all_results),
-            "results": all_results,
-        }
     except Exception as e:
         logger.error(f"Error in get_companies_listing: {e}")
         return [{"error": str(e)}]
 
 
+async def _fetch_all_pages(
+    naf,
+    type_entreprises,
+    postal_code=None,
+    departement=None,
+    max_concurrent_requests=MAX_CONCURRENT_REQUESTS,
+):
+    semaphore = asyncio.Semaphore(max_concurrent_requests)
+    # One pooled keep-alive transport for all pages, retrying failed connects
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=HTTP_MAX_RETRIES,
+        limits=httpx.Limits(
+            max_connections=HTTP_POOL_SIZE,
+            max_keepalive_connections=HTTP_POOL_SIZE,
+        ),
+    )
+    async with httpx.AsyncClient(transport=transport) as http_client:
+
+        async def fetch_page(page_num):
+            return await get_companies(
+                http_client,
+                semaphore,
+                naf,
+                type_entreprises,
+                postal_code,
+                departement,
+                page=page_num,
+            )
+
+        # Fetch first page to learn the page count
+        data = await fetch_page(1)
+        total_pages = data.get("total_pages", 1)
+        if total_pages > MAX_PAGES:
+            logger.warning(
+                f"API reports {total_pages} pages, only fetching the first {MAX_PAGES}"
+            )
+            total_pages = MAX_PAGES
+        pages_fetched = 1
+        # Keep the raw API records, fields are picked when writing the CSV
+        all_results = data.get("results", [])
+
+        # Fetch additional pages concurrently if needed
+        if total_pages > 1 and len(all_results) == PER_PAGE:
+            logger.debug(f"Fetching pages 2 to {total_pages} concurrently")
+            tasks = [
+                asyncio.create_task(fetch_page(page_num))
+                for page_num in range(2, total_pages + 1)
+            ]
+            try:
+                for task in tasks:
+                    page_data = await task
+                    pages_fetched += 1
+                    page_results = page_data.get("results", [])
+                    all_results.extend(page_results)
+                    # A short page is the last one, whatever total_pages said
+                    if "error" not in page_data and len(page_results) < PER_PAGE:
+                        break
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    logger.info(f"Returning {len(all_results)} companies across {pages_fetched} pages")
+    return {
+        "results_count": len(all_results),
+        "results": all_results,
+    }
+
+
 class OrigineTurc(BaseModel):
+    # Forbidding extras gives the strict schema structured outputs require
+    model_config = ConfigDict(extra="forbid")
+
     id: str
     origine_turque: bool
 
 
 class OrigineTurcResponse(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     results: List[OrigineTurc]
 
 
-def identify_turkish_names(names) -> List[OrigineTurc]:
-    logger.info(f"Identifying Turkish names for {len(names)} individuals")
-    names_string = json.dumps(names)
-    response = client.responses.parse(
-        model="gpt-5-mini",
-        input=[
-            {
-                "role": "system",
-                "content": SYSTEM_PROMPT,
-            },
+def _build_input(names):
+    return [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT,
+        },
+        {
+            "role": "user",
+            # One JSON record per line (NDJSON)
+            "content": b"".join(
+                orjson.dumps(name, option=orjson.OPT_APPEND_NEWLINE) for name in names
+            ).decode(),
+        },
+    ]
+
+
+def _chunk_names(names):
+    return [
+        names[i : i + OPENAI_BATCH_SIZE]
+        for i in range(0, len(names), OPENAI_BATCH_SIZE)
+    ]
+
+
+async def _classify_names(
+    client, names, semaphore: asyncio.Semaphore
+) -> List[OrigineTurc]:
+    async with semaphore:
+        response = await client.responses.parse(
+            model=OPENAI_MODEL,
+            input=_build_input(names),
+            text_format=OrigineTurcResponse,
+        )
+    logger.debug(f"Consumed {response.usage.total_tokens} tokens")
+    return response.output_parsed.results
+
+
+async def _classify_all_names(client, names) -> List[OrigineTurc]:
+    semaphore = asyncio.Semaphore(OPENAI_MAX_CONCURRENT_CALLS)
+    chunks = _chunk_names(names)
+    logger.debug(f"Sending {len(chunks)} batches of up to {OPENAI_BATCH_SIZE} names")
+    results = await asyncio.gather(
+        *[_classify_names(client, chunk, semaphore) for chunk in chunks],
+        return_exceptions=True,
+    )
+    origins = []
+    for chunk_results in results:
+        # A failed batch only loses its own names, not the whole run
+        if isinstance(chunk_results, Exception):
+            logger.error(f"Error classifying a batch of names: {chunk_results}")
+            continue
+        origins.extend(chunk_results)
+    return origins
+
+
+def _parse_batch_output(output_text) -> List[OrigineTurc]:
+    origins = []
+    for line in output_text.splitlines():
+        if not line.strip():
+            continue
+        custom_id = None
+        # A bad line only loses its own chunk, not the whole batch
+        try:
+            result = orjson.loads(line)
+            custom_id = result.get("custom_id")
+            response = result.get("response") or {}
+            if result.get("error") or response.get("status_code") != 200:
+                logger.error(
+                    f"Batch request {custom_id} failed: "
+                    f"{result.get('error') or response.get('status_code')}"
+                )
+                continue
+            line_origins = []
+            for item in response["body"].get("output", []):
+                if item.get("type") != "message":
+                    continue
+                for content in item.get("content", []):
+                    if content.get("type") == "output_text":
+                        parsed = OrigineTurcResponse.model_validate_json(
+                            content["text"]
+                        )
+                        line_origins.extend(parsed.results)
+            origins.extend(line_origins)
+        except Exception as e:
+            logger.error(f"Could not parse batch result {custom_id}: {e}")
+    return origins
+
+
+def _log_batch_errors(error_text):
+    for line in error_text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            result = orjson.loads(line)
+            body = (result.get("response") or {}).get("body") or {}
+            error = result.get("error") or body.get("error") or body
+            logger.error(f"Batch request {result.get('custom_id')} failed: {error}")
+        except Exception as e:
+            logger.error(f"Could not parse batch error line: {e}")
+
+
+async def _classify_all_names_batch(client, names) -> List[OrigineTurc]:
+    # Same strict schema that responses.parse sends on the synchronous path
+    text_format = {
+        "type": "json_schema",
+        "name": OrigineTurcResponse.__name__,
+        "schema": OrigineTurcResponse.model_json_schema(),
+        "strict": True,
+    }
+    requests_jsonl = b"".join(
+        orjson.dumps(
             {
-                "role": "user",
-                "content": names_string,
+                "custom_id": f"dirigeants-{i}",
+                "method": "POST",
+                "url": "/v1/responses",
+                "body": {
+                    "model": OPENAI_MODEL,
+                    "input": _build_input(chunk),
+                    "text": {"format": text_format},
+                },
             },
-        ],
-        text_format=OrigineTurcResponse,
+            option=orjson.OPT_APPEND_NEWLINE,
+        )
+        for i, chunk in enumerate(_chunk_names(names))
     )
-    logger.debug(f"Consumed {response.usage.total_tokens} tokens")
-    return response.output_parsed.results
+    input_file = await client.files.create(
+        file=("dirigeants_batch.jsonl", requests_jsonl), purpose="batch"
+    )
+    batch = await client.batches.create(
+        input_file_id=input_file.id,
+        endpoint="/v1/responses",
+        completion_window="24h",
+    )
+    logger.info(f"Submitted OpenAI batch {batch.id}, waiting for completion")
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        await asyncio.sleep(OPENAI_BATCH_POLL_INTERVAL)
+        batch = await client.batches.retrieve(batch.id)
+        logger.debug(f"Batch {batch.id} status: {batch.status}")
+
+    if batch.status not in ("completed", "expired"):
+        logger.error(f"Batch {batch.id} ended with status {batch.status}")
+        return []
+    if batch.status == "expired":
+        logger.warning(f"Batch {batch.id} expired, using its partial results")
+    # Failed requests go to the error file, not the output file
+    if batch.error_file_id:
+        errors = await client.files.content(batch.error_file_id)
+        _log_batch_errors(errors.text)
+    if not batch.output_file_id:
+        logger.error(f"Batch {batch.id} produced no output file")
+        return []
+    output = await client.files.content(batch.output_file_id)
+    return _parse_batch_output(output.text)
+
+
+async def _identify_turkish_names(names, use_batch_api) -> List[OrigineTurc]:
+    # Imported here so the CLI starts without paying for the OpenAI SDK
+    import openai
+
+    # Closed inside the event loop, before asyncio.run tears it down
+    async with openai.AsyncClient(api_key=os.getenv("OPENAI_API_KEY")) as client:
+        if use_batch_api:
+            return await _classify_all_names_batch(client, names)
+        return await _classify_all_names(client, names)
+
+
+def identify_turkish_names(names, use_batch_api=False) -> List[OrigineTurc]:
+    logger.info(f"Identifying Turkish names for {len(names)} individuals")
+    return asyncio.run(_identify_turkish_names(names, use_batch_api))
 
 
 def results_cleanup_and_enrich(
-    companies, check_turkish_names=False, filter_min_year=False
+    companies, check_turkish_names=False, filter_min_year=False, use_batch_api=False
 ):
     cleaned = []
-    all_dirigeants = []
+    # Keyed by id so a person heading several companies is classified once
+    all_dirigeants = {}
     for company in companies:
         if "error" in company:
             cleaned.append(company)
@@ -164,43 +470,80 @@ def results_cleanup_and_enrich(
         ]
         for dirigeant in dirigeants:
             unique_str = f"{dirigeant.get('nom', '')}{dirigeant.get('prenoms', '')}"
-            dirigeant["id"] = hashlib.md5(unique_str.encode("utf-8")).hexdigest()[:8]
-            all_dirigeants.append(
-                {
+            dirigeant["id"] = hashlib.blake2b(
+                unique_str.encode("utf-8"), digest_size=4
+            ).hexdigest()
+            if dirigeant["id"] not in all_dirigeants:
+                # The first given name is enough to judge the origin
+                prenoms = (dirigeant.get("prenoms") or "").split()
+                prenom = prenoms[0] if prenoms else ""
+                all_dirigeants[dirigeant["id"]] = {
                     "id": dirigeant["id"],
-                    "nom": dirigeant.get("nom", ""),
-                    "prenoms": dirigeant.get("prenoms", ""),
+                    "nom": (dirigeant.get("nom") or "")[:MAX_NAME_LENGTH],
+                    "prenom": prenom[:MAX_NAME_LENGTH],
                 }
-            )
         company["dirigeants"] = dirigeants
         cleaned.append(company)
 
     if check_turkish_names:
+        if not all_dirigeants:
+            logger.info("No dirigeants found to check for Turkish names.")
+            return cleaned
+        origins_map = {}
         try:
-            if not all_dirigeants:
-                logger.info("No dirigeants found to check for Turkish names.")
-                return cleaned
-            turkish_origins = identify_turkish_names(all_dirigeants)
-            for company in cleaned:
-                for dirigeant in company.get("dirigeants", []):
-                    match = next(
-                        (
-                            item
-                            for item in turkish_origins
-                            if item.id == dirigeant["id"]
-                        ),
-                        None,
-                    )
-                    if match:
-                        dirigeant["origine_turque"] = match.origine_turque
-                    else:
-                        dirigeant["origine_turque"] = False
+            turkish_origins = identify_turkish_names(
+                list(all_dirigeants.values()), use_batch_api=use_batch_api
+            )
+            origins_map = {item.id: item.origine_turque for item in turkish_origins}
         except Exception as e:
             logger.error(f"Error identifying Turkish names: {e}")
+        # Unclassified is not the same as not Turkish, leave those empty
+        unclassified = len(all_dirigeants.keys() - origins_map.keys())
+        if unclassified:
+            logger.warning(
+                f"{unclassified} of {len(all_dirigeants)} dirigeants could not be "
+                "classified, their origine_turque is left empty"
+            )
+        for company in cleaned:
+            for dirigeant in company.get("dirigeants", []):
+                dirigeant["origine_turque"] = origins_map.get(dirigeant["id"])
     return cleaned
 
 
+def iter_csv_rows(companies):
+    # Iterate over each company in results
+    for company in companies:
+        # Get company fields once, in header order, straight from the API record
+        siege = company.get("siege") or {}
+        company_data = (
+            company.get("siren", ""),
+            company.get("nom_complet", ""),
+            company.get("activite_principale", ""),
+            siege.get("adresse", ""),
+            siege.get("code_postal", ""),
+            siege.get("libelle_commune", ""),
+            company.get("date_creation", ""),
+            company.get("nature_juridique", ""),
+        )
+
+        # Iterate over each director in the company
+        for dirigeant in company.get("dirigeants", []):
+            # Director fields in header order, nationalite is not filled
+            dirigeant_data = (
+                dirigeant.get("nom", ""),
+                dirigeant.get("prenoms", ""),
+                dirigeant.get("date_de_naissance", ""),
+                dirigeant.get("qualite", ""),
+                dirigeant.get("origine_turque", False),
+                "",
+            )
+            yield dirigeant_data + company_data
+
+
 def write_csv(companies, filename="companies.csv"):
+    # Imported here so the CLI starts without paying for pandas
+    import pandas as pd
+
     headers = [
         "dirigeant_nom",
         "dirigeant_prenoms",
@@ -221,47 +564,21 @@ def write_csv(companies, filename="companies.csv"):
     # Ensure the directory "data_output" exists
     os.makedirs("data_output", exist_ok=True)
 
-    # Open the CSV file for writing
-    with open(
-        os.path.join("data_output", filename), "w", newline="", encoding="utf-8"
-    ) as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=headers)
-        writer.writeheader()
-
-        # Iterate over each company in results
-        for company in companies:
-            # Get company fields, handling None
-            company_data = {
-                "siren": company.get("siren", ""),
-                "nom_complet": company.get("nom_complet", ""),
-                "activite_principale": company.get("activite_principale", ""),
-                "adresse": company.get("adresse", ""),
-                "code_postal": company.get("code_postal", ""),
-                "libelle_commune": company.get("libelle_commune", ""),
-                "date_creation": company.get("date_creation", ""),
-                "nature_juridique": company.get("nature_juridique", ""),
-            }
-
-            # Iterate over each director in the company
-            for dirigeant in company.get("dirigeants", []):
-                # Get director fields, handling None
-                dirigeant_data = {
-                    "dirigeant_nom": dirigeant.get("nom", ""),
-                    "dirigeant_prenoms": dirigeant.get("prenoms", ""),
-                    "dirigeant_date_de_naissance": dirigeant.get(
-                        "date_de_naissance", ""
-                    ),
-                    "dirigeant_qualite": dirigeant.get("qualite", ""),
-                    "dirigeant_origine_turque": dirigeant.get("origine_turque", False),
-                }
-
-                # Combine company and director data
-                row = {**dirigeant_data, **company_data}
-                writer.writerow(row)
+    # Serialize all rows at once with pandas' C writer
+    df = pd.DataFrame.from_records(list(iter_csv_rows(companies)), columns=headers)
+    # Same CRLF line endings as the csv module
+    df.to_csv(
+        os.path.join("data_output", filename),
+        index=False,
+        encoding="utf-8",
+        lineterminator="\r\n",
+    )
     logger.info(f"CSV file '{filename}' written successfully.")
 
 
 if __name__ == "__main__":
+    import inquirer
+
     naf_choices = get_inquirer_formatted_naf_codes()
 
     questions = [
@@ -281,6 +598,12 @@ if __name__ == "__main__":
             message="Check for Turkish names? (requires OPENAI_API_KEY)",
             default=False,
         ),
+        inquirer.Confirm(
+            "use_batch_api",
+            message="Use the OpenAI Batch API? (50% cheaper, can take hours)",
+            default=False,
+            ignore=lambda answers: not answers["check_turkish_names"],
+        ),
         inquirer.Confirm(
             "filter_min_year",
             message=f"Filter companies created before {CREATION_MIN_YEAR}?",
@@ -299,6 +622,7 @@ if __name__ == "__main__":
         data["results"],
         check_turkish_names=answers["check_turkish_names"],
         filter_min_year=answers["filter_min_year"],
+        use_batch_api=answers.get("use_batch_api", False),
     )
     output_filename = (
         f"{datetime.now().strftime('%Y%m%d%H%M%S')}_companies_{naf}_{departement}.csv"